@@ -0,0 +1,168 @@
+# backend/benchmarks/today_count.py
+"""
+Benchmarks the dashboard's "present today" count as attendance history grows.
+
+    python -m benchmarks.today_count                       # 1M and 100M rows, every layout
+    python -m benchmarks.today_count --rows 1000000 --layout partitioned
+
+Rows are generated at a fixed daily rate, so more rows means more history while
+today's slice stays the same size. Layouts:
+
+    partitioned    the current monthly-partitioned table
+    indexed        one unpartitioned table with the same (courseid, datetime) index
+    unpartitioned  the schema before partitioning, without that index
+
+Comparing partitioned with indexed separates partition pruning from the index win.
+Each layout is built in its own scratch schema and dropped afterwards; the
+application tables are not touched.
+"""
+import argparse
+import math
+import statistics
+import time
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+from db import engine
+from dbmodels import Attendance
+from partitions import DEFAULT_COURSE_TIMEZONE, add_months, course_day_bounds, create_partition, month_start, next_month
+
+BATCH_ROWS = 5_000_000
+COURSES = 50
+STUDENTS = 5000
+
+# the schema before partitioning: naive timestamps and no index on the day-range filter.
+UNPARTITIONED_DDL = (
+    "CREATE TABLE attendance ("
+    "attendanceid SERIAL PRIMARY KEY, "
+    "studentid INTEGER NOT NULL, "
+    "courseid INTEGER NOT NULL, "
+    "datetime TIMESTAMP WITHOUT TIME ZONE NOT NULL)"
+)
+# unpartitioned, but with the same columns and index as the partitioned table.
+INDEXED_DDL = (
+    "CREATE TABLE attendance ("
+    "attendanceid SERIAL PRIMARY KEY, "
+    "studentid INTEGER NOT NULL, "
+    "courseid INTEGER NOT NULL, "
+    "datetime TIMESTAMP WITH TIME ZONE NOT NULL)",
+    "CREATE INDEX ix_attendance_courseid_datetime ON attendance (courseid, datetime)",
+)
+LAYOUTS = ["partitioned", "indexed", "unpartitioned"]
+
+
+def build(conn, layout, rows, rows_per_day):
+    schema = f"attendance_bench_{layout}"
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {schema}"))
+    conn.execute(text(f"SET search_path TO {schema}"))
+
+    seconds_per_row = 86400.0 / rows_per_day
+    now = datetime.now(timezone.utc)
+    if layout == "partitioned":
+        Attendance.__table__.create(conn)
+        oldest = now.timestamp() - rows * seconds_per_row
+        month = month_start(datetime.fromtimestamp(oldest, timezone.utc))
+        while month <= add_months(month_start(now), 1):
+            create_partition(conn, month)
+            month = next_month(month)
+        stamp = "CAST(:now AS timestamptz)"
+    elif layout == "indexed":
+        for ddl in INDEXED_DDL:
+            conn.execute(text(ddl))
+        stamp = "CAST(:now AS timestamptz)"
+    else:
+        conn.execute(text(UNPARTITIONED_DDL))
+        now = now.replace(tzinfo=None)
+        stamp = "CAST(:now AS timestamp)"
+
+    for offset in range(0, rows, BATCH_ROWS):
+        count = min(BATCH_ROWS, rows - offset)
+        conn.execute(text(
+            "INSERT INTO attendance (studentid, courseid, datetime) "
+            f"SELECT (g % {STUDENTS}) + 1, (g % {COURSES}) + 1, "
+            f"{stamp} - g * make_interval(secs => :step) "
+            "FROM generate_series(:first, :last) AS g"
+        ), {"now": now, "step": seconds_per_row, "first": offset, "last": offset + count - 1})
+        conn.commit()
+        print(f"  {layout}: loaded {offset + count:,} / {rows:,} rows")
+    conn.execute(text("ANALYZE attendance"))
+    conn.commit()
+    return schema
+
+
+TODAY_COUNT_SQL = (
+    "SELECT count(*) FROM attendance "
+    "WHERE courseid = :courseid AND datetime >= :start AND datetime < :end"
+)
+
+
+def plan_relations(node):
+    # distinct tables read by a plan; index scans report their table, not the index.
+    names = {node["Relation Name"]} if "Relation Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= plan_relations(child)
+    return names
+
+
+def measure(conn, layout, repeat):
+    # same filter as the dashboard endpoints, for course 1.
+    start_of_day, end_of_day = course_day_bounds(DEFAULT_COURSE_TIMEZONE)
+    if layout == "unpartitioned":
+        start_of_day = start_of_day.replace(tzinfo=None)
+        end_of_day = end_of_day.replace(tzinfo=None)
+    params = {"courseid": 1, "start": start_of_day, "end": end_of_day}
+
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {TODAY_COUNT_SQL}"), params).scalar()
+    scanned = plan_relations(plan[0]["Plan"])
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        present = conn.execute(text(TODAY_COUNT_SQL), params).scalar()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "present": present,
+        "median_ms": statistics.median(timings),
+        # nearest-rank percentile.
+        "p95_ms": timings[math.ceil(len(timings) * 0.95) - 1],
+        "relations_scanned": len(scanned),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", default="1000000,100000000", help="comma-separated table sizes")
+    parser.add_argument("--rows-per-day", type=int, default=50_000)
+    parser.add_argument("--layout", choices=LAYOUTS + ["all"], default="all")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per layout (at least 1)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch schemas")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.rows.split(",")]
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    layouts = LAYOUTS if args.layout == "all" else [args.layout]
+
+    results = []
+    for rows in sizes:
+        for layout in layouts:
+            with engine.connect() as conn:
+                schema = build(conn, layout, rows, args.rows_per_day)
+                result = measure(conn, layout, args.repeat)
+                conn.rollback()
+                if not args.keep:
+                    conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+                    conn.commit()
+            results.append((rows, layout, result))
+
+    print()
+    print(f"{'rows':>12}  {'layout':<13}  {'present':>7}  {'median ms':>9}  {'p95 ms':>8}  {'relations':>9}")
+    for rows, layout, result in results:
+        print(f"{rows:>12,}  {layout:<13}  {result['present']:>7}  {result['median_ms']:>9.2f}  "
+              f"{result['p95_ms']:>8.2f}  {result['relations_scanned']:>9}")
+
+
+if __name__ == "__main__":
+    main()
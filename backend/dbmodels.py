@@ -1,7 +1,8 @@
 # backend/dbmodels.py
-from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, Index
+from datetime import datetime, timezone
 from db import Base
+from partitions import DEFAULT_COURSE_TIMEZONE
 
 class Instructor(Base):
     __tablename__ = "instructors"
@@ -17,13 +18,21 @@ class Course(Base):
     courseid = Column(Integer, primary_key=True)
     coursename = Column(String(100), nullable=False)
     instructorid = Column(Integer)
+    # IANA zone name; "today" for this course is computed in this zone.
+    timezone = Column(String(64), nullable=False, default=DEFAULT_COURSE_TIMEZONE)
 
 class Attendance(Base):
+    # range-partitioned by month on datetime (UTC); partitions are managed in partitions.py.
     __tablename__ = "attendance"
-    attendanceid = Column(Integer, primary_key=True)
+    __table_args__ = (
+        Index("ix_attendance_courseid_datetime", "courseid", "datetime"),
+        {"postgresql_partition_by": "RANGE (datetime)"},
+    )
+    attendanceid = Column(Integer, primary_key=True, autoincrement=True)
     studentid = Column(Integer, nullable=False)
     courseid = Column(Integer, nullable=False)
-    datetime = Column(DateTime, nullable=False, default=datetime.now)
+    # the partition key has to be part of the primary key.
+    datetime = Column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc))
 
 class Student(Base):
     __tablename__ = "students"
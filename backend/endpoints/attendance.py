@@ -1,9 +1,10 @@
 # backend/endpoints/attendance.py
 from fastapi import APIRouter, HTTPException, Depends
-from datetime import datetime, date
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session
 from db import SessionLocal
 from dbmodels import Instructor, Course, StudentCourse, Attendance, Student
+from partitions import course_day_bounds
 
 router = APIRouter()
 
@@ -35,13 +36,20 @@ def get_attendance_data(username: str, db: Session = Depends(get_db)):
         .filter(StudentCourse.courseid.in_(course_ids))\
         .distinct().count()
 
-    today = date.today()
-    start_of_day = datetime(today.year, today.month, today.day)
-    end_of_day = datetime(today.year, today.month, today.day, 23, 59, 59)
+    # "today" depends on each course's time zone, so build one day range per zone.
+    courses_by_tz = {}
+    for course in courses:
+        courses_by_tz.setdefault(course.timezone, []).append(course.courseid)
+    today_filters = []
+    for tz_name, tz_course_ids in courses_by_tz.items():
+        start_of_day, end_of_day = course_day_bounds(tz_name)
+        today_filters.append(and_(
+            Attendance.courseid.in_(tz_course_ids),
+            Attendance.datetime >= start_of_day,
+            Attendance.datetime < end_of_day
+        ))
     present_today = db.query(Attendance)\
-        .filter(Attendance.courseid.in_(course_ids))\
-        .filter(Attendance.datetime >= start_of_day)\
-        .filter(Attendance.datetime <= end_of_day)\
+        .filter(or_(*today_filters))\
         .count()
 
     absent_today = total_students - present_today if total_students >= present_today else 0
@@ -87,13 +95,11 @@ def get_attendance_data_by_course(username: str, courseid: int, db: Session = De
         .filter(StudentCourse.courseid == courseid)\
         .distinct().count()
 
-    today = date.today()
-    start_of_day = datetime(today.year, today.month, today.day)
-    end_of_day = datetime(today.year, today.month, today.day, 23, 59, 59)
+    start_of_day, end_of_day = course_day_bounds(course.timezone)
     present_today = db.query(Attendance)\
         .filter(Attendance.courseid == courseid)\
         .filter(Attendance.datetime >= start_of_day)\
-        .filter(Attendance.datetime <= end_of_day)\
+        .filter(Attendance.datetime < end_of_day)\
         .count()
 
     absent_today = total_students - present_today if total_students >= present_today else 0
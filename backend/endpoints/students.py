@@ -5,11 +5,12 @@ from fastapi import APIRouter, HTTPException, Depends, File, UploadFile
 from sqlalchemy.orm import Session
 from PIL import Image
 import face_recognition
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 
-from db import SessionLocal
+from db import SessionLocal, engine
 from dbmodels import Student, Attendance, StudentCourse  
 from dbschema import StudentCreate
+from partitions import ensure_partition_for
 
 router = APIRouter()
 
@@ -162,10 +163,13 @@ async def verify_and_record_attendance(
 
     if verified:
         try:
+            # stored in UTC; day boundaries are applied per course time zone when reading.
+            now = datetime.now(timezone.utc)
+            ensure_partition_for(engine, now)
             new_attendance = Attendance(
             studentid=studentid,
             courseid=courseid,
-            datetime=datetime.now() - timedelta(hours=4)
+            datetime=now
             )
 
             db.add(new_attendance)
@@ -3,9 +3,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from db import engine, Base
 from endpoints import login, attendance, students
+from partitions import prepare_legacy_attendance, setup_attendance_partitions
 
-# create missing tables.
+# create missing tables; attendance is range-partitioned by month.
+prepare_legacy_attendance(engine)
 Base.metadata.create_all(bind=engine)
+setup_attendance_partitions(engine)
 
 app = FastAPI()
 
@@ -0,0 +1,191 @@
+# backend/partitions.py
+import os
+from functools import lru_cache
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from sqlalchemy import text
+
+ATTENDANCE_TABLE = "attendance"
+LEGACY_TABLE = "attendance_unpartitioned"
+DEFAULT_COURSE_TIMEZONE = os.getenv('DEFAULT_COURSE_TIMEZONE', 'America/New_York')
+# fail at startup on a bad default instead of on the first dashboard request.
+DEFAULT_COURSE_ZONE = ZoneInfo(DEFAULT_COURSE_TIMEZONE)
+# the old students.py stored datetime.now() - timedelta(hours=4) on a UTC server.
+LEGACY_UTC_OFFSET_HOURS = float(os.getenv('LEGACY_ATTENDANCE_UTC_OFFSET_HOURS', '4'))
+
+# months whose partition this process has created in a committed transaction.
+_known_months = set()
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def next_month(month):
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{ATTENDANCE_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(name):
+    # attendance_y2024m03 -> date(2024, 3, 1); anything else -> None.
+    prefix = f"{ATTENDANCE_TABLE}_y"
+    if not name.startswith(prefix) or len(name) != len(prefix) + 7 or name[-3] != "m":
+        return None
+    try:
+        return date(int(name[-7:-3]), int(name[-2:]), 1)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def course_zone(tz_name):
+    # unknown or malformed zone names fall back to the default zone; cached, so each warns once.
+    if not tz_name:
+        return DEFAULT_COURSE_ZONE
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError, OSError):
+        # on 3.9 a directory name such as "America" raises IsADirectoryError.
+        print(f"Unknown course time zone {tz_name!r}, using {DEFAULT_COURSE_TIMEZONE}")
+        return DEFAULT_COURSE_ZONE
+
+
+def course_day_bounds(tz_name, day=None):
+    """
+    Returns the [start, end) UTC instants of a calendar day in the course's time zone.
+    Comparing Attendance.datetime against these literal bounds lets Postgres prune
+    every monthly partition the day does not touch.
+    """
+    tz = course_zone(tz_name)
+    if day is None:
+        day = datetime.now(tz).date()
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+def partition_bounds(month):
+    # SQL literals for the month's [start, end) range in UTC.
+    return f"'{month.isoformat()} 00:00:00+00'", f"'{next_month(month).isoformat()} 00:00:00+00'"
+
+
+def create_partition(conn, month):
+    start, end = partition_bounds(month)
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {ATTENDANCE_TABLE} "
+        f"FOR VALUES FROM ({start}) TO ({end})"
+    ))
+
+
+def ensure_partitions(conn, first_month, last_month):
+    month = month_start(first_month)
+    while month <= last_month:
+        create_partition(conn, month)
+        month = next_month(month)
+
+
+def ensure_partition_for(engine, moment):
+    # own transaction, so a failed insert afterwards cannot roll the partition back.
+    month = month_start(moment.astimezone(timezone.utc))
+    if month not in _known_months:
+        with engine.begin() as conn:
+            create_partition(conn, month)
+        # only cache once committed; a rollback must not hide a missing partition.
+        _known_months.add(month)
+
+
+def list_partitions(conn):
+    # attached monthly partitions, oldest first.
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": ATTENDANCE_TABLE}).scalars().all()
+    months = [parse_partition_name(name) for name in rows]
+    return sorted(month for month in months if month is not None)
+
+
+def prepare_legacy_attendance(engine):
+    """
+    Moves an existing unpartitioned attendance table out of the way so that
+    create_all() can build the partitioned one under the original name.
+    """
+    with engine.begin() as conn:
+        relkind = conn.execute(text(
+            "SELECT relkind FROM pg_class "
+            "WHERE oid = to_regclass(:name)"
+        ), {"name": ATTENDANCE_TABLE}).scalar()
+        if relkind != "r":
+            return
+        sequence = conn.execute(text(
+            "SELECT pg_get_serial_sequence(:name, 'attendanceid')"
+        ), {"name": ATTENDANCE_TABLE}).scalar()
+        pkey = conn.execute(text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:name AS regclass) AND contype = 'p'"
+        ), {"name": ATTENDANCE_TABLE}).scalar()
+
+        conn.execute(text(f"ALTER TABLE {ATTENDANCE_TABLE} RENAME TO {LEGACY_TABLE}"))
+        if pkey:
+            conn.execute(text(f"ALTER TABLE {LEGACY_TABLE} RENAME CONSTRAINT {pkey} TO {LEGACY_TABLE}_pkey"))
+        if sequence:
+            conn.execute(text(f"ALTER SEQUENCE {sequence} RENAME TO {LEGACY_TABLE}_attendanceid_seq"))
+
+
+def migrate_legacy_attendance(engine):
+    """
+    Copies rows from the old unpartitioned table into the partitioned one.
+    Old timestamps are naive UTC shifted back by LEGACY_UTC_OFFSET_HOURS, so the
+    shift is added back and the result read as UTC.
+    """
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": LEGACY_TABLE}).scalar() is None:
+            return
+        bounds = conn.execute(text(f"SELECT min(datetime), max(datetime) FROM {LEGACY_TABLE}")).first()
+        if bounds[0] is not None:
+            # pad by a month on each side for rows that cross a month edge once shifted to UTC.
+            ensure_partitions(conn, add_months(month_start(bounds[0]), -1), add_months(month_start(bounds[1]), 1))
+        conn.execute(text(
+            f"INSERT INTO {ATTENDANCE_TABLE} (attendanceid, studentid, courseid, datetime) "
+            f"SELECT a.attendanceid, a.studentid, a.courseid, "
+            f"(a.datetime + make_interval(secs => :offset)) AT TIME ZONE 'UTC' "
+            f"FROM {LEGACY_TABLE} a"
+        ), {"offset": LEGACY_UTC_OFFSET_HOURS * 3600})
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence(:name, 'attendanceid'), "
+            f"COALESCE((SELECT max(attendanceid) FROM {ATTENDANCE_TABLE}), 0) + 1, false)"
+        ), {"name": ATTENDANCE_TABLE})
+        conn.execute(text(f"DROP TABLE {LEGACY_TABLE}"))
+
+
+def ensure_course_timezone_column(engine):
+    # create_all() does not alter existing tables.
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE courses ADD COLUMN IF NOT EXISTS timezone VARCHAR(64) "
+            "NOT NULL DEFAULT '" + DEFAULT_COURSE_TIMEZONE.replace("'", "''") + "'"
+        ))
+
+
+def setup_attendance_partitions(engine, months_ahead=2):
+    """
+    Brings the schema up to the partitioned layout and pre-creates partitions
+    from the current month through `months_ahead` months in the future.
+    Call prepare_legacy_attendance() before Base.metadata.create_all().
+    """
+    ensure_course_timezone_column(engine)
+    migrate_legacy_attendance(engine)
+    this_month = month_start(datetime.now(timezone.utc))
+    with engine.begin() as conn:
+        ensure_partitions(conn, this_month, add_months(this_month, months_ahead))
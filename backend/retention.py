@@ -0,0 +1,171 @@
+# backend/retention.py
+"""
+Retention job for the monthly attendance partitions.
+
+    python retention.py archive --keep-months 24   # roll old partitions into archive files
+    python retention.py restore 2022-09            # re-attach an archived month for reports
+    python retention.py list                       # attached partitions and archive files
+
+Archives are gzip-compressed CSV dumps named attendance_yYYYYmMM.csv.gz.
+Run `archive` from cron once a month; it also pre-creates upcoming partitions.
+Restored months older than --keep-months are archived again on the next run.
+"""
+import argparse
+import gzip
+import os
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+
+from db import engine
+from partitions import (
+    ATTENDANCE_TABLE, add_months, ensure_partitions, list_partitions,
+    month_start, parse_partition_name, partition_bounds, partition_name,
+)
+
+ARCHIVE_DIR = os.getenv('ATTENDANCE_ARCHIVE_DIR', '/app/archive')
+COLUMNS = "attendanceid, studentid, courseid, datetime"
+
+
+def archive_path(month, archive_dir):
+    return os.path.join(archive_dir, f"{partition_name(month)}.csv.gz")
+
+
+def fsync_dir(directory):
+    # makes a rename inside `directory` durable.
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def archive_partition(month, archive_dir):
+    """
+    Dumps one partition to a compressed file, then detaches and drops it, all
+    in one transaction. A SHARE lock on the partition keeps rows from being
+    written between the dump and the drop, and the file is fsynced and renamed
+    to its final name before the drop commits.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(month, archive_dir)
+    partial = path + ".partial"
+    table = partition_name(month)
+
+    with engine.begin() as conn:
+        conn.execute(text(f"LOCK TABLE {table} IN SHARE MODE"))
+        with open(partial, "wb") as raw_out:
+            with conn.connection.cursor() as cursor, gzip.GzipFile(fileobj=raw_out, mode="wb") as out:
+                cursor.copy_expert(f"COPY (SELECT {COLUMNS} FROM {table} ORDER BY attendanceid) TO STDOUT WITH CSV HEADER", out)
+            raw_out.flush()
+            os.fsync(raw_out.fileno())
+        os.replace(partial, path)
+        fsync_dir(archive_dir)
+
+        conn.execute(text(f"ALTER TABLE {ATTENDANCE_TABLE} DETACH PARTITION {table}"))
+        conn.execute(text(f"DROP TABLE {table}"))
+    return path
+
+
+def restore_partition(month, archive_dir):
+    """
+    Loads an archived month into a standalone table, then attaches it.
+    The parent table is only locked for the short ATTACH, not for the load;
+    the CHECK constraint lets ATTACH skip its validation scan.
+    """
+    path = archive_path(month, archive_dir)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No archive for {month:%Y-%m} at {path}")
+    table = partition_name(month)
+    start, end = partition_bounds(month)
+
+    with engine.begin() as conn:
+        if month in list_partitions(conn):
+            raise RuntimeError(f"Partition for {month:%Y-%m} is already attached")
+        # a table left behind by an earlier failed attach is already loaded.
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": table}).scalar() is None:
+            conn.execute(text(
+                f"CREATE TABLE {table} "
+                f"(LIKE {ATTENDANCE_TABLE} INCLUDING DEFAULTS INCLUDING INDEXES)"
+            ))
+            with conn.connection.cursor() as cursor, gzip.open(path, "rb") as src:
+                cursor.copy_expert(f"COPY {table} ({COLUMNS}) FROM STDIN WITH CSV HEADER", src)
+            conn.execute(text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_range "
+                f"CHECK (datetime IS NOT NULL AND datetime >= {start} AND datetime < {end})"
+            ))
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {ATTENDANCE_TABLE} ATTACH PARTITION {table} FOR VALUES FROM ({start}) TO ({end})"))
+        # the partition bound now enforces the range.
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {table}_range"))
+    return path
+
+
+def run_archive(keep_months, archive_dir, months_ahead=2):
+    # the current month must stay attached: running API processes cache it and would not recreate it.
+    if keep_months < 1:
+        raise ValueError(f"keep_months must be at least 1, got {keep_months}")
+    this_month = month_start(datetime.now(timezone.utc))
+    cutoff = add_months(this_month, -keep_months)
+    with engine.begin() as conn:
+        ensure_partitions(conn, this_month, add_months(this_month, months_ahead))
+        months = list_partitions(conn)
+    archived = []
+    for month in months:
+        if month < cutoff:
+            archived.append(archive_partition(month, archive_dir))
+    return archived
+
+
+def positive_int(value):
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected an integer, got {value!r}")
+    if parsed < 1:
+        raise argparse.ArgumentTypeError(f"Must be at least 1, got {parsed}")
+    return parsed
+
+
+def parse_month(value):
+    try:
+        parsed = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected YYYY-MM, got {value!r}")
+    return date(parsed.year, parsed.month, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive and restore monthly attendance partitions.")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    archive_cmd = commands.add_parser("archive", help="archive partitions older than --keep-months")
+    archive_cmd.add_argument("--keep-months", type=positive_int, default=24)
+
+    restore_cmd = commands.add_parser("restore", help="re-attach archived months")
+    restore_cmd.add_argument("months", nargs="+", type=parse_month, metavar="YYYY-MM")
+
+    commands.add_parser("list", help="show attached partitions and archive files")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "archive":
+        for path in run_archive(args.keep_months, args.archive_dir):
+            print("Archived:", path)
+    elif args.command == "restore":
+        for month in args.months:
+            print("Restored:", restore_partition(month, args.archive_dir))
+    elif args.command == "list":
+        with engine.connect() as conn:
+            for month in list_partitions(conn):
+                print("attached", f"{month:%Y-%m}")
+        if os.path.isdir(args.archive_dir):
+            for name in sorted(os.listdir(args.archive_dir)):
+                month = parse_partition_name(name[:-len(".csv.gz")]) if name.endswith(".csv.gz") else None
+                if month is not None:
+                    print("archived", f"{month:%Y-%m}", os.path.join(args.archive_dir, name))
+
+
+if __name__ == "__main__":
+    main()